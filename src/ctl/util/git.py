@@ -9,6 +9,7 @@ import logging
 import os
 import shutil
 import tempfile
+import time
 import urllib
 import uuid
 from typing import Callable, Union
@@ -33,6 +34,33 @@ __all__ = [
 ephemeral_git_context_state = contextvars.ContextVar("ephemeral_git_context_state")
 current_ephemeral_git_context = contextvars.ContextVar("current_ephemeral_git_context")
 
+# environment defaults for RepositoryConfig, read once at import time
+# instead of on every instantiation (each GitManager builds at least two)
+_ENV_DEFAULTS = {
+    "gitlab_url": os.getenv("GITLAB_URL"),
+    "gitlab_token": os.getenv("GITLAB_TOKEN"),
+    "github_token": os.getenv("GITHUB_TOKEN"),
+}
+
+# already opened git.Repo instances keyed by directory - opening a repo
+# parses .git/config and enumerates refs, so repeated GitManager
+# construction on the same checkout (common with the ephemeral_git_context
+# decorator) reuses one instance. Entries are evicted when their checkout
+# goes away (TemporaryGitContext.__exit__, stale-entry check in
+# _open_repository) so deleted checkouts do not accumulate here
+_REPO_CACHE: dict = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _base_url(url: str) -> str:
+    """
+    Returns the scheme and host portion of `url` - memoized since many
+    GitManager instances typically share the same service url
+    """
+
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
 
 def ephemeral_git_context(**init_kwargs):
     """
@@ -65,13 +93,9 @@ class RepositoryConfig(pydantic.BaseModel):
     Repository config model
     """
 
-    gitlab_url: str = pydantic.Field(default_factory=lambda: os.getenv("GITLAB_URL"))
-    gitlab_token: str = pydantic.Field(
-        default_factory=lambda: os.getenv("GITLAB_TOKEN")
-    )
-    github_token: str = pydantic.Field(
-        default_factory=lambda: os.getenv("GITHUB_TOKEN")
-    )
+    gitlab_url: str = _ENV_DEFAULTS["gitlab_url"]
+    gitlab_token: str = _ENV_DEFAULTS["gitlab_token"]
+    github_token: str = _ENV_DEFAULTS["github_token"]
 
 
 class Services:
@@ -95,6 +119,10 @@ class GitManager:
         within the repository once it's checked out.
     - allow_unsafe: Whether to allow unsafe operations such as hard resets
     - submodules: Whether to initialize submodules
+    - shallow: Whether to clone shallow (history truncated to the tip of
+        default_branch)
+    - partial_clone: Whether to clone with --filter=blob:none, transferring
+        commits and trees only and fetching blobs lazily on checkout
 
     **Attributes**
 
@@ -112,6 +140,8 @@ class GitManager:
     - repository_config: The repository config
     - allow_unsafe: Whether to allow unsafe operations such as hard resets
     - submodules: Whether to initialize submodules
+    - shallow: Whether the repository was/will be cloned shallow
+    - partial_clone: Whether the repository was/will be cloned blob-less
 
     **Properties**
 
@@ -136,6 +166,8 @@ class GitManager:
         allow_unsafe: bool = True,
         submodules: bool = True,
         repository_config: RepositoryConfig = None,
+        shallow: bool = True,
+        partial_clone: bool = False,
     ):
         self.url = url
         self.directory = directory
@@ -146,8 +178,24 @@ class GitManager:
         self.default_service = default_service
         self.allow_unsafe = allow_unsafe
         self.submodules = submodules
+        self.shallow = shallow
+        self.partial_clone = partial_clone
+
+        # cache of remote refs keyed by short branch name, built lazily
+        # in remote_branch_reference and invalidated whenever remote
+        # tracking refs may change (fetch, pull, push)
+        self._remote_refs_by_name = None
+
+        # monotonic timestamp of the last fetch, used by
+        # EphemeralGitContext to skip redundant fetches on nested entry
+        self._last_fetch_ts = None
 
         self.services = Services()
+        self._services_attempted = set()
+
+        # service projects resolved from urls, keyed on (service, url) -
+        # ogr re-parses the url (and may hit the api) on every lookup
+        self._project_cache = {}
 
         self.log = log if log else logging.getLogger(__name__)
 
@@ -165,7 +213,10 @@ class GitManager:
         """
 
         if self.default_service:
-            return getattr(self.services, self.default_service)
+            return getattr(self, self.default_service)
+
+        self._ensure_service("github")
+        self._ensure_service("gitlab")
 
         if self.services.github and self.services.gitlab:
             raise ValueError(
@@ -183,10 +234,12 @@ class GitManager:
 
     @property
     def gitlab(self):
+        self._ensure_service("gitlab")
         return self.services.gitlab
 
     @property
     def github(self):
+        self._ensure_service("github")
         return self.services.github
 
     @property
@@ -231,7 +284,7 @@ class GitManager:
         self.init_services(self.repository_config)
 
         try:
-            self.repo = git.Repo(self.directory)
+            self.repo = self._open_repository()
 
             # if url is not set we can get a list of remotes
             # and take the first one as origin
@@ -253,14 +306,40 @@ class GitManager:
                 )
 
             env = os.environ.copy()
+
+            # never block the clone on an interactive credential prompt -
+            # failing fast beats a multi-second stall behind an auth timeout
+            env.setdefault("GIT_TERMINAL_PROMPT", "0")
+
             self.log.debug(f"Cloning repository from {self.url}: {self.directory}")
+
+            # a shallow clone only transfers the tip of the default branch,
+            # which is all we need to operate - cuts clone time and bandwidth
+            # substantially on repositories with a lot of history.
+            #
+            # `--no-single-branch` keeps the default fetch refspec intact so
+            # branches created remotely after the clone can still be fetched.
+
+            # submodule fetches are network latency bound, not cpu bound,
+            # so let git run them in parallel
+            multi_options = ["--jobs=10"]
+            if self.shallow:
+                multi_options += ["--depth=1", "--no-single-branch", "--no-tags"]
+
+            # a partial clone transfers commit/tree objects only, blobs
+            # are fetched on demand when the working tree needs them
+            if self.partial_clone:
+                multi_options.append("--filter=blob:none")
+
             self.repo = git.Repo.clone_from(
                 self.url,
                 self.directory,
                 branch=self.default_branch,
                 progress=None,
                 env=env,
+                multi_options=multi_options or None,
             )
+            _REPO_CACHE[self.directory] = self.repo
             self.init_submodules()
 
         self.index = self.repo.index
@@ -277,6 +356,32 @@ class GitManager:
         # re-init services with the newly loaded config
         self.init_services(self.repository_config)
 
+    def _open_repository(self):
+        """
+        Opens the existing repository at self.directory, reusing an already
+        open instance when possible
+        """
+
+        repo = _REPO_CACHE.get(self.directory)
+
+        if repo is not None:
+            if os.path.isdir(repo.git_dir):
+                return repo
+            # checkout was deleted from under us - drop the dead entry
+            # so it does not pin the git.Repo (and its cat-file
+            # subprocesses) for the lifetime of the process
+            _REPO_CACHE.pop(self.directory, None)
+            repo.close()
+
+        # expand_vars=False skips environment variable expansion while
+        # parsing the repo config, search is limited to the directory itself
+
+        repo = git.Repo(
+            self.directory, search_parent_directories=False, expand_vars=False
+        )
+        _REPO_CACHE[self.directory] = repo
+        return repo
+
     def init_submodules(self):
         """
         Initializes and updates existing submodules
@@ -337,9 +442,16 @@ class GitManager:
                 f"Could not find origin for repository {self.url} (first is {remote.url})"
             )
 
+        self._remote_refs_by_name = None
+
     def init_services(self, config: RepositoryConfig):
         """
         Initializes the services for the repository
+
+        Service clients are not constructed here - they are built lazily
+        on first access through the `gitlab` / `github` properties, so a
+        GitManager that never talks to a service never pays for client
+        construction.
         """
         # why do we have 2 configs?
         if config.gitlab_url != self.repository_config.gitlab_url:
@@ -352,35 +464,53 @@ class GitManager:
         self.repository_config.gitlab_token = gitlab_token
         self.repository_config.gitlab_url = gitlab_url
 
-        if gitlab_url and not self.services.gitlab:
-            # instance_url wants only the scheme and host
-            # so we need to parse it out of the full url
-            instance_url = (
-                urllib.parse.urlparse(gitlab_url).scheme
-                + "://"
-                + urllib.parse.urlparse(gitlab_url).netloc
+        # allow lazy construction to re-attempt with the updated config
+        self._services_attempted = set()
+
+        if self.default_service and not getattr(self, self.default_service):
+            raise ValueError(
+                f"Could not initialize {self.default_service}, make sure the url and token are correct"
             )
 
+    def _ensure_service(self, name: str):
+        """
+        Constructs the service client for `name` ("gitlab" or "github") on
+        first access, if it is configured
+        """
+
+        if name in self._services_attempted:
+            return
+        self._services_attempted.add(name)
+
+        config = self.repository_config
+
+        if name == "gitlab" and config.gitlab_url and not self.services.gitlab:
+            # instance_url wants only the scheme and host
+            # so we need to parse it out of the full url
             self.services.gitlab = GitlabService(
                 token=config.gitlab_token,
-                instance_url=instance_url,
+                instance_url=_base_url(config.gitlab_url),
             )
-        if config.github_token and not self.services.github:
+        elif name == "github" and config.github_token and not self.services.github:
             self.services.github = GithubService(token=config.github_token)
 
-        if self.default_service and not getattr(self.services, self.default_service):
-            raise ValueError(
-                f"Could not initialize {self.default_service}, make sure the url and token are correct"
-            )
-
     def service_project(self, service: str = None):
         """
         Returns the service project for the service
         """
-        _service = getattr(self.services, service) if service else self.service
+        _service = getattr(self, service) if service else self.service
         if not _service:
             raise ValueError("No service configured, cannot get project")
-        return _service.get_project_from_url(self.url)
+
+        cache_key = (service, self.url)
+        project = self._project_cache.get(cache_key)
+
+        if project is None:
+            project = self._project_cache[cache_key] = _service.get_project_from_url(
+                self.url
+            )
+
+        return project
 
     def service_file_url(self, file_path: str, service: str = None):
         """
@@ -389,7 +519,7 @@ class GitManager:
         Will account for url, project name and branch
         """
 
-        _service = getattr(self.services, service) if service else self.service
+        _service = getattr(self, service) if service else self.service
         _project = self.service_project(service)
 
         return f"{_service.instance_url}/{_project.full_repo_name}/blob/{self.branch}/{file_path}"
@@ -399,12 +529,16 @@ class GitManager:
         Fetches the origin repository
         """
 
-        fetch_args = ["--all"]
+        # tags are never consumed through this manager and fetching
+        # remotes in parallel is a free win when there are several
+        fetch_args = ["--all", "--no-tags", "--jobs=4"]
         if prune:
             fetch_args.append("--prune")
 
         self.log.info(f"Fetching from {self.origin.name}")
         fetch_info = self.repo.git.fetch(*fetch_args)
+        self._remote_refs_by_name = None
+        self._last_fetch_ts = time.monotonic()
         self.log.debug(f"Fetch info: {fetch_info}")
         return fetch_info
 
@@ -414,6 +548,7 @@ class GitManager:
         """
         self.log.info(f"Pulling from {self.origin.name}")
         fetch_info = self.repo.git.pull(self.origin.name, self.branch)
+        self._remote_refs_by_name = None
         self.log.debug(f"Fetch info: {fetch_info}")
         return fetch_info
 
@@ -423,34 +558,38 @@ class GitManager:
         """
         self.log.info(f"Pushing {self.repo.head.ref.name} to {self.origin.name}")
         self.repo.git.push(self.origin.name, self.repo.head.ref.name, force=force)
+        self._remote_refs_by_name = None
 
     def sync(self):
         """
         Fetches the remote repository and will merge with a fast-forward
         strategy if possible and then push back to origin.
-        """
 
-        self.fetch()
-        if self.require_remote_branch() is True:
-            # branch did not exist remotely yet
-            self.push()
-
-            # fetch again to make sure we have the latest refs
-            self.fetch()
-            return
+        Fetch and merge happen in a single `git pull --no-rebase` process,
+        halving the subprocess count on this path.
+        """
 
-        # fast forward merge from origin
         self.log.info(f"Merging {self.origin.name}/{self.branch} into {self.branch}")
 
         try:
-            self.repo.git.merge(f"{self.origin.name}/{self.branch}")
+            self.repo.git.pull("--no-rebase", self.origin.name, self.branch)
+            self._remote_refs_by_name = None
         except git.exc.GitCommandError as exc:
-            if "not possible to fast-forward, aborting" in exc.stderr.lower():
+            stderr = exc.stderr.lower()
+
+            if "couldn't find remote ref" in stderr:
+                # branch did not exist remotely yet, push it and set
+                # up tracking
+                self._remote_refs_by_name = None
+                self.require_remote_branch()
+                return
+
+            if "not possible to fast-forward, aborting" in stderr:
                 raise MergeNotPossible(
                     f"Could not fast-forward merge {self.origin.name}/{self.branch} into {self.branch}"
                 )
-            else:
-                raise
+
+            raise
 
         # push
         self.push()
@@ -526,6 +665,10 @@ class GitManager:
             create (bool): Whether to create the branch if it does not exist
         """
 
+        if branch_name == self.branch:
+            # already on the requested branch, nothing to do
+            return
+
         self.log.info(f"Switching to branch {branch_name}")
         # fetch to make sure we have the latest refs
         self.fetch()
@@ -538,9 +681,12 @@ class GitManager:
         branch_exists_remotely = self.remote_branch_reference(branch_name)
 
         # if branch exists remote but not locally, create from remote
+        # in a single checkout invocation (tracking is set up automatically
+        # since the start point is a remote tracking branch)
         if branch_exists_remotely and not branch_exists_locally:
-            self.fetch()
-            self.repo.git.checkout(branch_name)
+            self.repo.git.checkout(
+                "-B", branch_name, f"{self.origin.name}/{branch_name}"
+            )
             self.index = self.repo.index
             return
 
@@ -621,22 +767,28 @@ class GitManager:
         - file_paths: A list of file paths to check for changes. If not provided, will check all files.
         """
 
-        # identify new files in file paths that dont exist in index
+        # we only need the paths, so ask git directly instead of going
+        # through GitPython's diff machinery which builds a Diff object
+        # per changed entry - untracked files are only consulted when
+        # file_paths narrows the scope. -z gives NUL-delimited verbatim
+        # paths; without it git C-quotes non-ascii paths (core.quotepath)
+        # and they would never match file_paths
 
-        if file_paths:
-            new_files = [
-                path for path in file_paths if path in self.repo.untracked_files
-            ]
-            changed_files = [
-                item.a_path
-                for item in self.index.diff(None)
-                if item.a_path in file_paths
-            ]
-        else:
-            new_files = []
-            changed_files = [item.a_path for item in self.index.diff(None)]
+        fp_set = set(file_paths) if file_paths else None
 
-        return list(set(changed_files + new_files))
+        result = set()
+
+        if fp_set:
+            untracked = self.repo.git.ls_files(
+                "--others", "--exclude-standard", "-z"
+            ).split("\0")
+            result.update(path for path in untracked if path in fp_set)
+
+        for path in self.repo.git.diff("--name-only", "-z").split("\0"):
+            if path and (fp_set is None or path in fp_set):
+                result.add(path)
+
+        return list(result)
 
     def remote_branch_reference(self, branch_name: str):
         """
@@ -655,12 +807,18 @@ class GitManager:
             # no remote
             return None
 
-        for ref in self.origin.refs:
-            if ref.name.split("/")[-1] == branch_name:
-                # always the same as active_branch?
-                self.log.debug(f"found remote branch {ref}")
-                return ref
-        return None
+        if self._remote_refs_by_name is None:
+            # build the short-name -> ref map once, subsequent lookups
+            # are O(1) instead of rescanning all remote refs - rpartition
+            # allocates one tuple per ref where split built a full list
+            self._remote_refs_by_name = {
+                ref.name.rpartition("/")[2]: ref for ref in self.origin.refs
+            }
+
+        ref = self._remote_refs_by_name.get(branch_name)
+        if ref is not None:
+            self.log.debug(f"found remote branch {ref}")
+        return ref
 
     def archive_branch(self, new_name: str, branch: str = None):
         """
@@ -703,6 +861,8 @@ class GitManager:
         # delete local branch if it exists
         repo.delete_head(branch, force=True)
 
+        self._remote_refs_by_name = None
+
     def create_change_request(
         self,
         title: str,
@@ -893,6 +1053,7 @@ class EphemeralGitContextState(pydantic.BaseModel):
     readonly: bool = False
     inactive: bool = False
     force_push: bool = False
+    fetch_ttl: float = 5.0
 
     context_id: str = pydantic.Field(default_factory=lambda: str(uuid.uuid4())[:8])
 
@@ -931,6 +1092,9 @@ class EphemeralGitContext:
         - readonly (bool, optional): Whether to only allow reading from the repository. Defaults to False.
         - inactive (bool, optional): Whether to deactivate the context. Defaults to False.
         - force_push (bool, optional): Whether to force push. Defaults to False.
+        - fetch_ttl (float, optional): Skip the fetch on context entry if the
+            git manager fetched less than this many seconds ago (e.g., from a
+            parent context). Set to 0 to always fetch. Defaults to 5.
         """
 
         # these should not be set directly
@@ -958,9 +1122,18 @@ class EphemeralGitContext:
             return self
 
         # reset the current branch
-        self.stash_current_context()
-        self.git_manager.fetch()
-        if self.git_manager.is_dirty:
+        #
+        # is_dirty runs a full `git status` - compute it once and thread
+        # it through instead of probing again after the stash
+        dirty = self.git_manager.is_dirty
+        self.stash_current_context(dirty)
+
+        # skip the fetch when a parent context (or any other caller)
+        # fetched this repository moments ago
+        last_fetch = self.git_manager._last_fetch_ts
+        if last_fetch is None or time.monotonic() - last_fetch >= self.state.fetch_ttl:
+            self.git_manager.fetch()
+        if dirty and not self.state.stash_pushed:
             self.reset()
 
         # track what branch we were on before switching
@@ -1012,9 +1185,8 @@ class EphemeralGitContext:
             elif self.active:
                 # context is only allowed to read, but active, so we log
                 # what would have been committed / pushed
-                for changed_file in self.git_manager.changed_files(
-                    self.state.files_to_add
-                ):
+                changed_files = self.git_manager.changed_files(self.state.files_to_add)
+                for changed_file in changed_files:
                     self.git_manager.log.info(
                         f"[readonly] would commit changes: {changed_file}"
                     )
@@ -1083,11 +1255,17 @@ class EphemeralGitContext:
 
         self.git_manager.reset(hard=True, from_origin=from_origin)
 
-    def stash_current_context(self):
+    def stash_current_context(self, dirty: bool = None):
         # stash current repo state if we are moving into a nested
         # context
+        #
+        # `dirty` can be passed in when the caller already knows the
+        # working tree state, avoiding a second `git status`
+
+        if dirty is None:
+            dirty = self.git_manager.is_dirty
 
-        if not self.git_manager.is_dirty:
+        if not dirty:
             # nothing to stash
 
             return
@@ -1108,16 +1286,16 @@ class EphemeralGitContext:
             # that the changes that are there can be ignored, so we can just return
             return
 
-        if not self.git_manager.changed_files(self.state.files_to_add):
+        changed_files = self.git_manager.changed_files(self.state.files_to_add)
+
+        if not changed_files:
             # nothing to commit/push so we can just return
             return
 
         if exc_type is None:
             try:
                 # Commit all changes
-                self.git_manager.add(
-                    self.git_manager.changed_files(self.state.files_to_add)
-                )
+                self.git_manager.add(changed_files)
                 self.git_manager.commit(self.state.commit_message)
                 # Attempt to push
                 self.git_manager.push(force=self.state.force_push)
@@ -1163,10 +1341,17 @@ class EphemeralGitContext:
         # make sure current branch exists remotely
         self.git_manager.require_remote_branch()
 
-        # create change request
-        self.state.change_request.source_branch = self.git_manager.branch
-        self.state.change_request.target_branch = self.git_manager.default_branch
-        self.git_manager.create_change_request(**self.state.change_request.model_dump())
+        # create change request - pass the fields explicitly, model_dump
+        # would re-walk and serialize the model on every commit
+        change_request = self.state.change_request
+        change_request.source_branch = self.git_manager.branch
+        change_request.target_branch = self.git_manager.default_branch
+        self.git_manager.create_change_request(
+            title=change_request.title,
+            description=change_request.description,
+            target_branch=change_request.target_branch,
+            source_branch=change_request.source_branch,
+        )
 
     def add_files(self, file_paths: list[str]):
         """
@@ -1179,7 +1364,31 @@ class EphemeralGitContext:
         if not self.active:
             return
 
-        self.state.files_to_add.extend(file_paths)
+        # dedupe while preserving order - long running contexts can add
+        # the same path many times and files_to_add is scanned on close
+        seen = set(self.state.files_to_add)
+        for path in file_paths:
+            if path not in seen:
+                self.state.files_to_add.append(path)
+                seen.add(path)
+
+    def stage(self, file_path: str, content: str):
+        """
+        Write content to a file inside the repository and queue it for the
+        context commit - shorthand for the common write-then-add_files pair.
+
+        Args:
+            file_path (str): Path of the file, relative to the repository root
+            content (str): Content to write
+        """
+
+        if not self.active:
+            return
+
+        with open(os.path.join(self.git_manager.directory, file_path), "w") as fh:
+            fh.write(content)
+
+        self.add_files([file_path])
 
 
 class TemporaryGitContext:
@@ -1224,5 +1433,10 @@ class TemporaryGitContext:
         self.git_manager.log.debug(
             f"Removing temporary repository {self.git_manager.directory}"
         )
+        # evict the cached git.Repo before removing the checkout, otherwise
+        # every TemporaryGitContext cycle pins a dead entry in _REPO_CACHE
+        repo = _REPO_CACHE.pop(self.git_manager.directory, None)
+        if repo is not None:
+            repo.close()
         shutil.rmtree(self.git_manager.directory)
         return False
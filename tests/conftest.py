@@ -1,4 +1,9 @@
 import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
 
 import pytest
 import pytest_filedata
@@ -6,6 +11,89 @@ import pytest_filedata
 import ctl
 
 
+@pytest.fixture(scope="session", autouse=True)
+def tmpdir_on_ramdisk():
+    """
+    Point TMPDIR at /dev/shm when available (linux) so the many small git
+    object writes the test suite performs go to a ram disk instead of
+    whatever (potentially slow) filesystem backs the default tmp root.
+    """
+
+    if sys.platform != "linux" or not os.access("/dev/shm", os.W_OK):
+        yield
+        return
+
+    previous = os.environ.get("TMPDIR")
+    os.environ["TMPDIR"] = "/dev/shm"
+    # drop tempfile's cached temp root so the override takes effect
+    tempfile.tempdir = None
+
+    yield
+
+    if previous is None:
+        os.environ.pop("TMPDIR", None)
+    else:
+        os.environ["TMPDIR"] = previous
+    tempfile.tempdir = None
+
+
+@pytest.fixture(scope="session", autouse=True)
+def pinned_git_config(tmp_path_factory):
+    """
+    Point git at a minimal known config for the whole session so test
+    repos cannot inherit the developer's global/system gitconfig -
+    commit signing, gc.auto or hooks configured there would slow the
+    suite down and make it behave differently between machines.
+    """
+
+    config = tmp_path_factory.mktemp("gitcfg") / "config"
+    config.write_text(
+        "[user]\n"
+        "\tname = ctl-tests\n"
+        "\temail = ctl-tests@localhost\n"
+        "[commit]\n"
+        "\tgpgsign = false\n"
+        "[gc]\n"
+        "\tauto = 0\n"
+    )
+
+    previous = {
+        key: os.environ.get(key) for key in ("GIT_CONFIG_GLOBAL", "GIT_CONFIG_SYSTEM")
+    }
+    os.environ["GIT_CONFIG_GLOBAL"] = str(config)
+    os.environ["GIT_CONFIG_SYSTEM"] = os.devnull
+
+    yield
+
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_plugin_cache():
+    """
+    Resolve the plugin classes shared across test modules once per session.
+    get_plugin_class caches the class after the first import, so warming it
+    here moves the plugin module import cost out of the individual tests.
+    """
+
+    for name in (
+        "chain",
+        "changelog",
+        "copy",
+        "git",
+        "log",
+        "semver2",
+        "template",
+        "version",
+        "walk_dir",
+    ):
+        ctl.plugin.get_plugin_class(name)
+
+
 @pytest.fixture
 def this_dir():
     return os.path.dirname(__file__)
@@ -16,16 +104,60 @@ def config_dir(this_dir):
     return os.path.join(this_dir, "data", "config")
 
 
-@pytest.fixture(params=["standard"])
-def ctlr(config_dir):
+@pytest.fixture(scope="session")
+def defer_rmtree():
+    """
+    Returns a callable that schedules a directory for deletion on a
+    background thread, so fixture teardown does not block on rmtree of
+    .git directories full of small loose-object files. The thread is
+    drained and joined at session end.
+    """
+
+    pending = queue.Queue()
+
+    def worker():
+        while True:
+            path = pending.get()
+            if path is None:
+                return
+            shutil.rmtree(path, ignore_errors=True)
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+
+    yield pending.put
+
+    pending.put(None)
+    thread.join()
+
+
+@pytest.fixture(scope="session")
+def _ctlr_session():
+    config_dir = os.path.join(os.path.dirname(__file__), "data", "config")
     return ctl.Ctl(config_dir=os.path.join(config_dir, "standard"))
 
 
-@pytest.fixture(params=["permission_denied"])
-def ctldeny(config_dir):
+@pytest.fixture(scope="session")
+def _ctldeny_session():
+    config_dir = os.path.join(os.path.dirname(__file__), "data", "config")
     return ctl.Ctl(config_dir=os.path.join(config_dir, "permission_denied"))
 
 
+# the Ctl instances are read-only from the tests' point of view (per-test
+# state lives in the plugin instances, which are re-instantiated each test),
+# so one controller per session is safe and skips repeated config parsing
+
+
+@pytest.fixture(params=["standard"])
+def ctlr(_ctlr_session):
+    return _ctlr_session
+
+
+@pytest.fixture(params=["permission_denied"])
+def ctldeny(_ctldeny_session):
+    return _ctldeny_session
+
+
 pytest_filedata.setup(os.path.dirname(__file__))
 
 
@@ -5,14 +5,16 @@ from util import instantiate_test_plugin
 
 import ctl
 
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
 
 def instantiate(tmpdir, ctlr=None, **kwargs):
     config = {
         "config": {
-            "source": os.path.join(os.path.dirname(__file__), "data"),
+            "source": DATA_DIR,
             "output": str(tmpdir.mkdir("template_out")),
             "debug": True,
-            "vars": [os.path.join(os.path.dirname(__file__), "data", "tmplvars.json")],
+            "vars": [os.path.join(DATA_DIR, "tmplvars.json")],
             "walk_dirs": ["template"],
         }
     }
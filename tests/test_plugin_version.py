@@ -8,6 +8,8 @@ from util import instantiate_version as instantiate
 import ctl
 from ctl.exceptions import PermissionDenied
 
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
 
 def test_init():
     ctl.plugin.get_plugin_class("version")
@@ -42,7 +44,7 @@ def test_tag_pyproject(tmpdir, ctlr):
     pyproject_path = os.path.join(dummy_repo.checkout_path, "pyproject.toml")
 
     shutil.copyfile(
-        os.path.join(os.path.dirname(__file__), "data", "version", "pyproject.toml"),
+        os.path.join(DATA_DIR, "version", "pyproject.toml"),
         pyproject_path,
     )
 
@@ -1,9 +1,9 @@
 import os
+import shutil
 import tempfile
 from unittest.mock import MagicMock, patch
 
 import pytest
-import yaml
 from git import Repo, GitCommandError
 from ogr.abstract import PRStatus
 
@@ -20,47 +20,69 @@ class DummyException(Exception):
     pass
 
 
-# Fixture to create a temporary directory and initialize a git repository
-@pytest.fixture
-def git_repo():
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        repo = Repo.init(tmp_dir, initial_branch="main")
+def read_file(path):
+    """read and return file contents, guaranteeing the handle is closed"""
+    with open(path) as fh:
+        return fh.read()
 
-        assert repo.active_branch.name == "main"
 
-        # create an empty README file and commit it
+# Template repositories are built once per session and copied into a
+# fresh temporary directory for each test - a filesystem copy is far
+# cheaper than re-running git init + commits per test.
 
-        open(os.path.join(tmp_dir, "README.md"), "w").close()
-        repo.index.add(["README.md"])
-        repo.index.commit("Initial commit")
 
-        yield tmp_dir, repo
+@pytest.fixture(scope="session")
+def _git_repo_template(tmp_path_factory):
+    tmp_dir = str(tmp_path_factory.mktemp("git_repo_template"))
+    repo = Repo.init(tmp_dir, initial_branch="main")
 
+    # create an empty README file and commit it
 
-# Fixture to create a temporary directory, initialize a git repository, and add a config yaml file
-@pytest.fixture
-def git_repo_with_config():
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        repo = Repo.init(tmp_dir, initial_branch="main")
-        assert repo.active_branch.name == "main"
+    open(os.path.join(tmp_dir, "README.md"), "w").close()
+    repo.index.add(["README.md"])
+    repo.index.commit("Initial commit")
+
+    # pack the loose objects once so the per-test copytree moves a single
+    # packfile instead of individual object files
+    repo.git.gc("--prune=now", "--quiet")
+
+    return tmp_dir
+
+
+@pytest.fixture(scope="session")
+def _git_repo_with_config_template(tmp_path_factory):
+    tmp_dir = str(tmp_path_factory.mktemp("git_repo_config_template"))
+    repo = Repo.init(tmp_dir, initial_branch="main")
 
-        # create an empty README file and commit it
-        open(os.path.join(tmp_dir, "README.md"), "w").close()
-        repo.index.add(["README.md"])
-        repo.index.commit("Initial commit")
+    # create an empty README file and a config yaml file and commit them
+    open(os.path.join(tmp_dir, "README.md"), "w").close()
+    with open(os.path.join(tmp_dir, "config.yaml"), "w") as f:
+        f.write("gitlab_url: https://gitlab.com\ngithub_token: test_token\n")
 
-        # create a config yaml file
-        config = {
-            "gitlab_url": "https://gitlab.com",
-            "github_token": "test_token",
-        }
-        with open(os.path.join(tmp_dir, "config.yaml"), "w") as f:
-            yaml.dump(config, f)
+    repo.index.add(["README.md", "config.yaml"])
+    repo.index.commit("Initial commit")
 
-        repo.index.add(["config.yaml"])
-        repo.index.commit("Add config")
+    repo.git.gc("--prune=now", "--quiet")
 
-        yield tmp_dir, repo
+    return tmp_dir
+
+
+# Fixture to create a temporary directory and initialize a git repository
+@pytest.fixture
+def git_repo(_git_repo_template, defer_rmtree):
+    tmp_dir = tempfile.mkdtemp()
+    shutil.copytree(_git_repo_template, tmp_dir, dirs_exist_ok=True)
+    yield tmp_dir, Repo(tmp_dir)
+    defer_rmtree(tmp_dir)
+
+
+# Fixture to create a temporary directory, initialize a git repository, and add a config yaml file
+@pytest.fixture
+def git_repo_with_config(_git_repo_with_config_template, defer_rmtree):
+    tmp_dir = tempfile.mkdtemp()
+    shutil.copytree(_git_repo_with_config_template, tmp_dir, dirs_exist_ok=True)
+    yield tmp_dir, Repo(tmp_dir)
+    defer_rmtree(tmp_dir)
 
 
 # fixture to create two git repostirories and make one the submodule of the other
@@ -76,14 +98,12 @@ def git_repo_with_submodule():
 
         # init submodule repository and add a README file
         submodule_repo = Repo.init(submodule_dir, initial_branch="main")
-        assert submodule_repo.active_branch.name == "main"
         open(os.path.join(submodule_dir, "README.md"), "w").close()
         submodule_repo.index.add(["README.md"])
         submodule_repo.index.commit("Initial commit")
 
         # init main repository and add a README file
         main_repo = Repo.init(main_dir, initial_branch="main")
-        assert main_repo.active_branch.name == "main"
         open(os.path.join(main_dir, "README.md"), "w").close()
         main_repo.index.add(["README.md"])
         main_repo.index.commit("Initial commit")
@@ -103,9 +123,23 @@ def git_repo_with_submodule():
 # Fixture to create a temporary directory to be later used to clone
 # a repository into
 @pytest.fixture
-def clone_dir():
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        yield tmp_dir
+def clone_dir(defer_rmtree):
+    tmp_dir = tempfile.mkdtemp()
+    yield tmp_dir
+    defer_rmtree(tmp_dir)
+
+
+# Fixture replacing the GithubService / GitlabService classes with mocks,
+# shared by the service related tests instead of each stacking its own
+# pair of @patch decorators
+@pytest.fixture
+def mocked_services():
+    with patch("ctl.util.git.GithubService") as mock_github_service, patch(
+        "ctl.util.git.GitlabService"
+    ) as mock_gitlab_service:
+        mock_github_service.return_value = MagicMock()
+        mock_gitlab_service.return_value = MagicMock()
+        yield mock_github_service, mock_gitlab_service
 
 
 # Test that a GitManager instance can be created
@@ -147,6 +181,24 @@ def test_git_manager_switch_branch(git_repo):
     assert git_manager.repo.active_branch.name == "test"
 
 
+# Test that cloning over a real transport (file:// url) produces an actual
+# shallow clone - git silently ignores --depth for plain local paths, so the
+# other tests never exercise the shallow=True default - and that the clone
+# can still be synced afterwards
+def test_git_manager_shallow_clone(git_repo, clone_dir):
+    remote_dir, git_repo = git_repo
+    git_manager = GitManager(url=f"file://{remote_dir}", directory=clone_dir)
+    assert os.path.exists(os.path.join(git_manager.repo.git_dir, "shallow"))
+    # Make a change to the "remote" repository and sync it into the
+    # shallow clone
+    with open(os.path.join(remote_dir, "test_shallow.txt"), "w") as f:
+        f.write("Test")
+    git_repo.index.add(["test_shallow.txt"])
+    git_repo.index.commit("Test commit")
+    git_manager.sync()
+    assert os.path.exists(os.path.join(clone_dir, "test_shallow.txt"))
+
+
 # Test that a GitManager instance can pull from a "remote" repository
 def test_git_manager_pull(git_repo, clone_dir):
     remote_dir, git_repo = git_repo
@@ -158,7 +210,7 @@ def test_git_manager_pull(git_repo, clone_dir):
     git_repo.index.commit("Test commit")
     # Pull the change into the local repository
     git_manager.pull()
-    assert "test.txt" in os.listdir(clone_dir)
+    assert os.path.exists(os.path.join(clone_dir, "test.txt"))
 
 
 # Test that a GitManager instance can push to a "remote" repository
@@ -177,7 +229,7 @@ def test_git_manager_push(git_repo, clone_dir):
     git_manager.push()
     # Switch to the new branch on the remote repository and check that the change was pushed
     git_repo.git.checkout(branch_name)
-    assert "test.txt" in os.listdir(remote_dir)
+    assert os.path.exists(os.path.join(remote_dir, "test.txt"))
 
 
 # Test that a GitManger instance can --force push to a "remote" repository
@@ -206,7 +258,7 @@ def test_git_manager_force_push(git_repo, clone_dir):
     git_manager.push(force=True)
     # Switch to the new branch on the remote repository and check that the change was pushed
     git_repo.git.checkout(branch_name)
-    assert "test.txt" in os.listdir(remote_dir)
+    assert os.path.exists(os.path.join(remote_dir, "test.txt"))
 
 
 # Test that the GitManager changed_files method correctly returns a list of changed files
@@ -278,26 +330,23 @@ def test_git_manager_add_and_commit(git_repo):
     git_manager.add(["test_commit.txt"])
     git_manager.commit("Test commit")
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_commit.txt" in file_paths
+    assert "test_commit.txt" in commit_tree
 
 
 # Test that a GitManager instance can correctly load repository config
-@patch("ctl.util.git.GithubService")
-@patch("ctl.util.git.GitlabService")
-def test_git_manager_load_repository_config(
-    mock_gitlab_service, mock_github_service, git_repo_with_config
-):
+def test_git_manager_load_repository_config(mocked_services, git_repo_with_config):
+    mock_github_service, mock_gitlab_service = mocked_services
+
     tmp_dir, repo = git_repo_with_config
     repo.create_remote("origin", url="http://localhost")
     git_manager = GitManager(url="http://localhost", directory=tmp_dir)
 
-    # Mock the GithubService and GitlabService instances
-    mock_github_service.return_value = MagicMock()
-    mock_gitlab_service.return_value = MagicMock()
-
     assert git_manager.repository_config.gitlab_url == "https://gitlab.com"
 
+    # services are constructed lazily on first access
+    assert git_manager.github is not None
+    assert git_manager.gitlab is not None
+
     # Check that the GithubService and GitlabService were called with the correct arguments
     mock_github_service.assert_called_once_with(token="test_token")
     mock_gitlab_service.assert_called_once_with(
@@ -306,12 +355,12 @@ def test_git_manager_load_repository_config(
 
 
 # Test that a GitManager instance correctly sets the default_service property
-@patch("ctl.util.git.GithubService")
-@patch("ctl.util.git.GitlabService")
 @patch("ctl.util.git.RepositoryConfig")
 def test_git_manager_default_service(
-    mock_repo_config, mock_gitlab_service, mock_github_service, git_repo_with_config
+    mock_repo_config, mocked_services, git_repo_with_config
 ):
+    mock_github_service, mock_gitlab_service = mocked_services
+
     mock_config = MagicMock()
     mock_config.gitlab_url = None
     mock_config.gitlab_token = None
@@ -324,10 +373,6 @@ def test_git_manager_default_service(
         url="http://localhost", directory=tmp_dir, default_service="github"
     )
 
-    # Mock the GithubService and GitlabService instances
-    mock_github_service.return_value = MagicMock()
-    mock_gitlab_service.return_value = MagicMock()
-
     git_manager.load_repository_config("config.yaml")
     assert git_manager.default_service == "github"
     assert mock_github_service.call_count == 1
@@ -335,12 +380,10 @@ def test_git_manager_default_service(
 
 
 # Test that a GitManager instance correctly returns the default service or the only available service
-@patch("ctl.util.git.GithubService")
-@patch("ctl.util.git.GitlabService")
 @patch("ctl.util.git.RepositoryConfig")
-def test_git_manager_service(
-    mock_repo_config, mock_gitlab_service, mock_github_service, git_repo_with_config
-):
+def test_git_manager_service(mock_repo_config, mocked_services, git_repo_with_config):
+    mock_github_service, mock_gitlab_service = mocked_services
+
     mock_config = MagicMock()
     mock_config.gitlab_url = None
     mock_config.gitlab_token = None
@@ -353,10 +396,6 @@ def test_git_manager_service(
         url="http://localhost", directory=tmp_dir, default_service="github"
     )
 
-    # Mock the GithubService and GitlabService instances
-    mock_github_service.return_value = MagicMock()
-    mock_gitlab_service.return_value = MagicMock()
-
     git_manager.load_repository_config("config.yaml")
     assert git_manager.service == git_manager.services.github
     assert mock_github_service.call_count == 1
@@ -386,7 +425,7 @@ def test_git_manager_sync(git_repo, clone_dir):
     git_repo.index.commit("Test sync commit")
     # Sync the local repository with the "remote" repository
     git_manager.sync()
-    assert "test_sync.txt" in os.listdir(clone_dir)
+    assert os.path.exists(os.path.join(clone_dir, "test_sync.txt"))
 
 
 # Test that a GitManager instance can sync with a "remote" repository and create a new branch if it does not exist
@@ -405,7 +444,7 @@ def test_git_manager_sync_with_new_branch(git_repo, clone_dir):
     git_manager.sync()
     # Switch to the new branch on the remote repository and check that the change was pushed
     git_repo.git.checkout(new_branch)
-    assert "test_sync.txt" in os.listdir(remote_dir)
+    assert os.path.exists(os.path.join(remote_dir, "test_sync.txt"))
 
 
 # Test that a GitManager instance can sync with a "remote" repository and merge changes
@@ -432,8 +471,8 @@ def test_git_manager_sync_with_merge(git_repo, clone_dir):
     git_manager.repo.index.commit("Test sync local commit")
     # Sync the local repository with the "remote" repository
     git_manager.sync()
-    assert "test_sync_remote.txt" in os.listdir(clone_dir)
-    assert "test_sync_local.txt" in os.listdir(clone_dir)
+    assert os.path.exists(os.path.join(clone_dir, "test_sync_remote.txt"))
+    assert os.path.exists(os.path.join(clone_dir, "test_sync_local.txt"))
 
 
 def test_submodule_init(git_repo_with_submodule, clone_dir):
@@ -454,20 +493,19 @@ def test_submodule_init_disabled(git_repo_with_submodule, clone_dir):
     assert not os.path.exists(os.path.join(clone_dir, "test_submodule", "README.md"))
 
 
-@patch("ctl.util.git.GithubService")
-@patch("ctl.util.git.GitlabService")
 @patch.object(GitManager, "service_project")
 @patch("ctl.util.git.RepositoryConfig")
 def test_git_manager_create_merge_request(
     mock_repo_config,
     mock_service_project,
-    mock_gitlab_service,
-    mock_github_service,
+    mocked_services,
     git_repo_with_config,
 ):
     """
     Test that the GitManager.create_merge_request method correctly creates a merge request
     """
+    mock_github_service, mock_gitlab_service = mocked_services
+
     tmp_dir, repo = git_repo_with_config
 
     mock_config = MagicMock()
@@ -477,11 +515,6 @@ def test_git_manager_create_merge_request(
     mock_config.gitlab_token = "fake-gitlab-token"
     mock_repo_config.return_value = mock_config
 
-    # Mock the GithubService and GitlabService instances
-    mock_github_service.return_value = MagicMock()
-    mock_gitlab_instance = MagicMock()
-    mock_gitlab_service.return_value = mock_gitlab_instance
-
     repo.create_remote("origin", url="http://localhost")
     git_manager = GitManager(
         url="http://localhost", directory=tmp_dir, default_service="gitlab"
@@ -523,15 +556,12 @@ def test_git_manager_create_merge_request(
         ("test", "test-2", PRStatus.open, False),
     ],
 )
-@patch("ctl.util.git.GithubService")
-@patch("ctl.util.git.GitlabService")
 @patch.object(GitManager, "service_project")
 @patch("ctl.util.git.RepositoryConfig")
 def test_git_manager_create_merge_request_existing(
     mock_repo_config,
     mock_service_project,
-    mock_gitlab_service,
-    mock_github_service,
+    mocked_services,
     git_repo_with_config,
     source_branch,
     target_branch,
@@ -541,6 +571,8 @@ def test_git_manager_create_merge_request_existing(
     """
     Test that the GitManager.create_merge_request method correctly updates an existing merge request
     """
+    mock_github_service, mock_gitlab_service = mocked_services
+
     tmp_dir, repo = git_repo_with_config
 
     mock_config = MagicMock()
@@ -550,11 +582,6 @@ def test_git_manager_create_merge_request_existing(
     mock_config.gitlab_token = "fake-gitlab-token"
     mock_repo_config.return_value = mock_config
 
-    # Mock the GithubService and GitlabService instances
-    mock_github_service.return_value = MagicMock()
-    mock_gitlab_instance = MagicMock()
-    mock_gitlab_service.return_value = mock_gitlab_instance
-
     repo.create_remote("origin", url="http://localhost")
     git_manager = GitManager(
         url="http://localhost", directory=tmp_dir, default_service="gitlab"
@@ -610,9 +637,7 @@ def test_ephemeral_git_context_success(git_repo, clone_dir):
         assert git_manager.branch == "test"
 
         # Create a new file and add it to the index within the context
-        with open(os.path.join(clone_dir, "test_context.txt"), "w") as f:
-            f.write("Test")
-        ctx.add_files(["test_context.txt"])
+        ctx.stage("test_context.txt", "Test")
 
     # outside of context, currently in branch `main`
 
@@ -621,8 +646,7 @@ def test_ephemeral_git_context_success(git_repo, clone_dir):
     # assert new file not in main branch
 
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_context.txt" not in file_paths
+    assert "test_context.txt" not in commit_tree
 
     # switch to test branch
 
@@ -631,8 +655,7 @@ def test_ephemeral_git_context_success(git_repo, clone_dir):
     # asset files were committed
 
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_context.txt" in file_paths
+    assert "test_context.txt" in commit_tree
 
     # assert test branch now exists remotely
 
@@ -668,9 +691,7 @@ def test_ephemeral_git_context_success_with_force_push(git_repo, clone_dir):
         assert git_manager.branch == "test"
 
         # Create a new file and add it to the index within the context
-        with open(os.path.join(clone_dir, "test_context.txt"), "w") as f:
-            f.write("Test")
-        ctx.add_files(["test_context.txt"])
+        ctx.stage("test_context.txt", "Test")
 
     # outside of context, currently in branch `main`
 
@@ -679,8 +700,7 @@ def test_ephemeral_git_context_success_with_force_push(git_repo, clone_dir):
     # assert new file not in main branch
 
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_context.txt" not in file_paths
+    assert "test_context.txt" not in commit_tree
 
     # switch to test branch
 
@@ -689,8 +709,7 @@ def test_ephemeral_git_context_success_with_force_push(git_repo, clone_dir):
     # asset files were committed
 
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_context.txt" in file_paths
+    assert "test_context.txt" in commit_tree
 
     # assert test branch now exists remotely
 
@@ -715,15 +734,12 @@ def test_ephemeral_git_context_success_with_validate_clean(git_repo, clone_dir):
         validate_clean=validate_clean,
     ) as ctx:
         # Create a new file and add it to the index within the context
-        with open(os.path.join(clone_dir, "test_context.txt"), "w") as f:
-            f.write("Test")
-        ctx.add_files(["test_context.txt"])
+        ctx.stage("test_context.txt", "Test")
 
     # asset files were NOT committed
 
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_context.txt" not in file_paths
+    assert "test_context.txt" not in commit_tree
 
     # assert test branch is still missing from remote
 
@@ -732,18 +748,17 @@ def test_ephemeral_git_context_success_with_validate_clean(git_repo, clone_dir):
 
 # Test that EphemeralGitContext correctly sets up and tears down the repository and also
 # creates a change request if change_request is set
-@patch("ctl.util.git.GithubService")
-@patch("ctl.util.git.GitlabService")
 @patch.object(GitManager, "service_project")
 @patch("ctl.util.git.RepositoryConfig")
 def test_ephemeral_git_context_success_with_change_request(
     mock_repo_config,
     mock_service_project,
-    mock_gitlab_service,
-    mock_github_service,
+    mocked_services,
     git_repo_with_config,
     clone_dir,
 ):
+    mock_github_service, mock_gitlab_service = mocked_services
+
     remote_dir, git_repo = git_repo_with_config
 
     mock_config = MagicMock()
@@ -753,9 +768,6 @@ def test_ephemeral_git_context_success_with_change_request(
     mock_config.gitlab_token = "fake-gitlab-token"
     mock_repo_config.return_value = mock_config
 
-    # Mock the GithubService and GitlabService instances
-    mock_github_service.return_value = MagicMock()
-    mock_gitlab_service.return_value = MagicMock()
     # Mock the service_project method to return a mock project
     mock_project = MagicMock()
     mock_service_project.return_value = mock_project
@@ -784,9 +796,7 @@ def test_ephemeral_git_context_success_with_change_request(
         assert git_manager.branch == "test"
 
         # Create a new file and add it to the index within the context
-        with open(os.path.join(clone_dir, "test_context.txt"), "w") as f:
-            f.write("Test")
-        ctx.add_files(["test_context.txt"])
+        ctx.stage("test_context.txt", "Test")
 
     # assert change request was created
 
@@ -806,8 +816,7 @@ def test_ephemeral_git_context_success_with_change_request(
     git_manager.switch_branch("test")
 
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_context.txt" in file_paths
+    assert "test_context.txt" in commit_tree
     assert mock_gitlab_service.call_count == 1
     mock_gitlab_service.assert_called_once_with(
         token="fake-gitlab-token", instance_url="http://localhost"
@@ -824,32 +833,29 @@ def test_ephemeral_git_context_failure(git_repo, clone_dir):
             git_manager=git_manager, commit_message="Test commit"
         ) as ctx:
             # Create a new file and add it to the index within the context
-            with open(os.path.join(clone_dir, "test_context.txt"), "w") as f:
-                f.write("Test")
-            ctx.add_files(["test_context.txt"])
+            ctx.stage("test_context.txt", "Test")
             # Raise an exception to trigger the failure handling
             raise DummyException("Test exception")
 
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_context.txt" not in file_paths
+    assert "test_context.txt" not in commit_tree
 
 
 # Test that EpemeralGitContext correctly handles readonly mode
-def test_ephemeral_git_context_readonly(git_repo, clone_dir):
-    remote_dir, git_repo = git_repo
-    git_manager = GitManager(url=remote_dir, directory=clone_dir)
+def test_ephemeral_git_context_readonly(git_repo):
+    # readonly never pushes or pulls anything meaningful, so the repo can
+    # be its own remote - avoids cloning into a separate directory
+    tmp_dir, repo = git_repo
+    repo.create_remote("origin", url=f"file://{tmp_dir}")
+    git_manager = GitManager(url=f"file://{tmp_dir}", directory=tmp_dir)
 
     with EphemeralGitContext(
         git_manager=git_manager, commit_message="Test commit", readonly=True
     ) as ctx:
         # Create a new file and add it to the index within the context
-        with open(os.path.join(clone_dir, "test_context.txt"), "w") as f:
-            f.write("Test")
-        ctx.add_files(["test_context.txt"])
+        ctx.stage("test_context.txt", "Test")
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_context.txt" not in file_paths
+    assert "test_context.txt" not in commit_tree
 
 
 # Test nested EphemeralGitContexts
@@ -863,9 +869,7 @@ def test_nested_ephemeral_git_contexts(git_repo, clone_dir):
         assert git_manager.branch == "outer"
 
         # Create a new file and add it to the index within the context
-        with open(os.path.join(clone_dir, "test_context_outer_1.txt"), "w") as f:
-            f.write("Test")
-        ctx.add_files(["test_context_outer_1.txt"])
+        ctx.stage("test_context_outer_1.txt", "Test")
 
         with EphemeralGitContext(
             git_manager=git_manager, branch="inner", commit_message="Nested Test commit"
@@ -873,17 +877,13 @@ def test_nested_ephemeral_git_contexts(git_repo, clone_dir):
             assert git_manager.branch == "inner"
 
             # Create a new file and add it to the index within the context
-            with open(os.path.join(clone_dir, "test_context_inner_1.txt"), "w") as f:
-                f.write("Test")
-            ctx2.add_files(["test_context_inner_1.txt"])
+            ctx2.stage("test_context_inner_1.txt", "Test")
 
         # test that branch is "outer"
         assert git_manager.branch == "outer"
 
         # Create a new file and add it to the index within the context
-        with open(os.path.join(clone_dir, "test_context_outer_2.txt"), "w") as f:
-            f.write("Test")
-        ctx.add_files(["test_context_outer_2.txt"])
+        ctx.stage("test_context_outer_2.txt", "Test")
 
     # back to default branch
     assert git_manager.branch == git_manager.default_branch
@@ -893,12 +893,12 @@ def test_nested_ephemeral_git_contexts(git_repo, clone_dir):
     git_repo.git.checkout("outer")
 
     # check that the files exist at their remote branches
-    assert "test_context_outer_1.txt" in os.listdir(remote_dir)
-    assert "test_context_outer_2.txt" in os.listdir(remote_dir)
+    assert os.path.exists(os.path.join(remote_dir, "test_context_outer_1.txt"))
+    assert os.path.exists(os.path.join(remote_dir, "test_context_outer_2.txt"))
 
     git_repo.git.checkout("inner")
 
-    assert "test_context_inner_1.txt" in os.listdir(remote_dir)
+    assert os.path.exists(os.path.join(remote_dir, "test_context_inner_1.txt"))
 
 
 # Test inactive ephemeral git context
@@ -930,8 +930,7 @@ def test_inactive_ephemeral_git_context(git_repo, clone_dir):
             assert f.read() == "Test"
 
     commit_tree = git_manager.repo.head.commit.tree
-    file_paths = [blob.path for blob in commit_tree.traverse() if blob.type == "blob"]
-    assert "test_context.txt" not in file_paths
+    assert "test_context.txt" not in commit_tree
 
 
 # Test nested EphemeralGitContexts where the outer context is inactive
@@ -967,9 +966,7 @@ def test_nested_inactive_ephemeral_git_contexts(git_repo, clone_dir):
             assert git_manager.branch == "inner"
 
             # Create a new file and add it to the index within the context
-            with open(os.path.join(clone_dir, "test_context_inner_1.txt"), "w") as f:
-                f.write("Test")
-            ctx2.add_files(["test_context_inner_1.txt"])
+            ctx2.stage("test_context_inner_1.txt", "Test")
 
         # test that branch is back to default
         assert git_manager.branch == git_manager.default_branch
@@ -995,7 +992,7 @@ def test_nested_inactive_ephemeral_git_contexts(git_repo, clone_dir):
 
     git_repo.git.checkout("inner")
 
-    assert "test_context_inner_1.txt" in os.listdir(remote_dir)
+    assert os.path.exists(os.path.join(remote_dir, "test_context_inner_1.txt"))
 
 
 # Test nested readonly context, where outer context is read-only
@@ -1069,7 +1066,7 @@ def test_nested_readonly_ephemeral_git_contexts(git_repo, clone_dir):
 
     git_repo.git.checkout("inner")
 
-    assert "test_context_inner_1.txt" in os.listdir(remote_dir)
+    assert os.path.exists(os.path.join(remote_dir, "test_context_inner_1.txt"))
 
     # finally we we open another local context to outer, and it should be reset from main
     # since it was never committed
@@ -1088,7 +1085,7 @@ def test_nested_readonly_ephemeral_git_contexts(git_repo, clone_dir):
 
         # check that README.md has been reset
 
-        assert open(os.path.join(clone_dir, "README.md")).read() == ""
+        assert read_file(os.path.join(clone_dir, "README.md")) == ""
 
 
 # Test that ephemeral context deletes local branch before switching to it
@@ -1103,7 +1100,7 @@ def test_ephemeral_git_context_delete_local_branch(git_repo, clone_dir):
 
     git_manager.switch_branch("test", create=True)
 
-    orig_readme_content = open(os.path.join(clone_dir, "README.md")).read()
+    orig_readme_content = read_file(os.path.join(clone_dir, "README.md"))
 
     # change README.md
 
@@ -1119,7 +1116,7 @@ def test_ephemeral_git_context_delete_local_branch(git_repo, clone_dir):
     ) as ctx:
         # check that README.md has been reset
 
-        assert open(os.path.join(clone_dir, "README.md")).read() == orig_readme_content
+        assert read_file(os.path.join(clone_dir, "README.md")) == orig_readme_content
 
 
 # Test that ephemeral context deletes local branch before switching to it
@@ -1134,7 +1131,7 @@ def test_ephemeral_git_context_delete_local_branch_inactive(git_repo, clone_dir)
 
     git_manager.switch_branch("test", create=True)
 
-    orig_readme_content = open(os.path.join(clone_dir, "README.md")).read()
+    orig_readme_content = read_file(os.path.join(clone_dir, "README.md"))
 
     # change README.md
 
@@ -1153,7 +1150,7 @@ def test_ephemeral_git_context_delete_local_branch_inactive(git_repo, clone_dir)
     ) as ctx:
         # check that README.md has NOT been reset
 
-        assert open(os.path.join(clone_dir, "README.md")).read() == orig_readme_content
+        assert read_file(os.path.join(clone_dir, "README.md")) == orig_readme_content
 
 
 # Test that ephemeral context deletes local branch before switching to it
@@ -1171,11 +1168,11 @@ def test_ephemeral_git_context_delete_local_branch_remake_from_remote(
     git_repo.git.commit("-am", "Test commit")
     git_repo.git.checkout("main")
 
-    assert open(os.path.join(remote_dir, "README.md")).read() == ""
+    assert read_file(os.path.join(remote_dir, "README.md")) == ""
 
     git_repo.git.checkout("test")
 
-    assert open(os.path.join(remote_dir, "README.md")).read() == "Testing initial"
+    assert read_file(os.path.join(remote_dir, "README.md")) == "Testing initial"
 
     git_repo.git.checkout("main")
 
@@ -1201,21 +1198,21 @@ def test_ephemeral_git_context_delete_local_branch_remake_from_remote(
     git_manager.repo.index.commit("Test commit")
 
     git_manager.switch_branch("main")
-    assert open(os.path.join(clone_dir, "README.md")).read() == ""
+    assert read_file(os.path.join(clone_dir, "README.md")) == ""
 
     with EphemeralGitContext(
         git_manager=git_manager, branch="test", commit_message="Test commit"
     ) as ctx:
         # check that README.md has been reset
 
-        assert open(os.path.join(clone_dir, "README.md")).read() == orig_readme_content
+        assert read_file(os.path.join(clone_dir, "README.md")) == orig_readme_content
 
     with EphemeralGitContext(
         git_manager=git_manager, branch="main", commit_message="Test commit"
     ) as ctx:
         # check that README.md has been reset
 
-        assert open(os.path.join(clone_dir, "README.md")).read() == ""
+        assert read_file(os.path.join(clone_dir, "README.md")) == ""
 
 
 # Test current_ephemeral_git_context holds the current ctx
@@ -1269,9 +1266,7 @@ def test_stash_between_contexts(git_repo, clone_dir):
             assert git_manager.branch == "inner"
 
             # Create a new file and add it to the index within the context
-            with open(os.path.join(clone_dir, "test_context_inner_1.txt"), "w") as f:
-                f.write("Test")
-            ctx2.add_files(["test_context_inner_1.txt"])
+            ctx2.stage("test_context_inner_1.txt", "Test")
 
         assert ctx2.state.stash_popped
 
@@ -1291,15 +1286,15 @@ def test_stash_between_contexts(git_repo, clone_dir):
     git_repo.git.checkout("outer")
 
     # check that the files exist at their remote branches
-    assert "test_context_outer_2.txt" in os.listdir(remote_dir)
+    assert os.path.exists(os.path.join(remote_dir, "test_context_outer_2.txt"))
 
     git_repo.git.checkout("inner")
 
-    assert "test_context_inner_1.txt" in os.listdir(remote_dir)
+    assert os.path.exists(os.path.join(remote_dir, "test_context_inner_1.txt"))
 
     # assert that README.md was stashed and popped
 
-    assert "README.md" in os.listdir(clone_dir)
+    assert os.path.exists(os.path.join(clone_dir, "README.md"))
     with open(os.path.join(clone_dir, "README.md")) as f:
         assert f.read() == "Testing initial"
 